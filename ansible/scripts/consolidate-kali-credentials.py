@@ -8,6 +8,73 @@ import os
 import sys
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+
+SEPARATOR = "=" * 80
+
+HEADER_TEMPLATE = f"""{SEPARATOR}
+GOAD KALI LINUX CREDENTIALS
+Generated: {{generated}}
+Total Instances: {{total}}
+{SEPARATOR}
+
+These credentials are for RDP and SSH access to Kali Linux boxes.
+Each Kali box has been configured with:
+  - pentester user (recommended for testing)
+  - xrdp enabled (RDP access on port 3389)
+  - All standard Kali tools pre-installed
+
+{SEPARATOR}
+
+"""
+
+FOOTER = f"""{SEPARATOR}
+USAGE NOTES
+{SEPARATOR}
+
+RDP Access:
+  Use any RDP client (Windows Remote Desktop, Remmina, etc.)
+  Connect to the Kali box floating IP address
+  Use 'pentester' user for best experience
+
+SSH Access:
+  ssh pentester@<floating-ip>
+  ssh -J sshjump@ssh.cyberrange.rit.edu pentester@<floating-ip>
+
+Security Notes:
+  - These are randomly generated passwords unique to each instance
+  - Keep this document secure
+  - Passwords are also stored on each Kali box at /home/pentester/password.txt
+
+{SEPARATOR}"""
+
+
+def parse_credential_file(pwd_file: os.DirEntry):
+    """Read a single Kali credential file, exiting if it can't be read"""
+    # Extract network/instance from filename
+    # Format: goad-N-kali-password.txt
+    instance_name = pwd_file.name[:-4].removesuffix("-password")  # Remove .txt first
+
+    try:
+        # Unbuffered bulk read: the files are tiny, so skip BufferedIO setup
+        fd = os.open(pwd_file.path, os.O_RDONLY)
+        try:
+            credentials = os.read(fd, pwd_file.stat().st_size).decode('utf-8')
+        finally:
+            os.close(fd)
+    except (OSError, UnicodeDecodeError) as e:
+        # A missing instance in the printout is worse than no printout at all
+        print(f"Error: Could not read {pwd_file.path}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    # Parse credentials - one "user:password" entry per line
+    cred_dict = dict(line.split(':', 1) for line in credentials.splitlines() if ':' in line)
+
+    return {
+        'instance': instance_name,
+        'credentials': cred_dict
+    }
 
 
 def consolidate_credentials(creds_dir: str, output_file: str = None):
@@ -19,8 +86,12 @@ def consolidate_credentials(creds_dir: str, output_file: str = None):
         print(f"Error: Credentials directory not found: {creds_dir}", file=sys.stderr)
         sys.exit(1)
 
-    # Find all password files
-    password_files = sorted(creds_path.glob("*-password.txt"))
+    # Find all password files in a single directory pass
+    password_files = []
+    with os.scandir(creds_path) as entries:
+        for entry in entries:
+            if entry.name.endswith("-password.txt") and entry.is_file(follow_symlinks=False):
+                password_files.append(entry)
 
     if not password_files:
         print(f"Error: No password files found in {creds_dir}", file=sys.stderr)
@@ -28,112 +99,51 @@ def consolidate_credentials(creds_dir: str, output_file: str = None):
 
     print(f"Found {len(password_files)} Kali credential files")
 
+    now = datetime.now()
+
     # Default output file
     if output_file is None:
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        timestamp = now.strftime('%Y%m%d_%H%M%S')
         output_file = creds_path.parent / f"KALI_CREDENTIALS_{timestamp}.txt"
     else:
         output_file = Path(output_file)
 
-    # Read and consolidate credentials
-    all_credentials = []
+    # Read and consolidate credentials - the reads are I/O bound, so overlap them
+    with ThreadPoolExecutor(max_workers=min(32, len(password_files))) as executor:
+        all_credentials = list(executor.map(parse_credential_file, password_files))
 
-    for pwd_file in password_files:
-        # Extract network/instance from filename
-        # Format: goad-N-kali-password.txt
-        filename = pwd_file.stem  # Remove .txt
-        instance_name = filename.replace("-password", "")
+    # Sort by instance name (the only sort - directory order is arbitrary until here)
+    all_credentials.sort(key=itemgetter('instance'))
 
-        try:
-            with open(pwd_file, 'r') as f:
-                credentials = f.read().strip()
-
-            # Parse credentials
-            cred_lines = credentials.split('\n')
-            cred_dict = {}
-            for line in cred_lines:
-                if ':' in line:
-                    user, password = line.split(':', 1)
-                    cred_dict[user] = password
-
-            all_credentials.append({
-                'instance': instance_name,
-                'credentials': cred_dict
-            })
-
-        except Exception as e:
-            print(f"Warning: Error reading {pwd_file}: {e}", file=sys.stderr)
-            continue
-
-    # Sort by instance name
-    all_credentials.sort(key=lambda x: x['instance'])
-
-    # Generate formatted output
-    output_lines = []
-    output_lines.append("="*80)
-    output_lines.append("GOAD KALI LINUX CREDENTIALS")
-    output_lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    output_lines.append(f"Total Instances: {len(all_credentials)}")
-    output_lines.append("="*80)
-    output_lines.append("")
-    output_lines.append("These credentials are for RDP and SSH access to Kali Linux boxes.")
-    output_lines.append("Each Kali box has been configured with:")
-    output_lines.append("  - pentester user (recommended for testing)")
-    output_lines.append("  - xrdp enabled (RDP access on port 3389)")
-    output_lines.append("  - All standard Kali tools pre-installed")
-    output_lines.append("")
-    output_lines.append("="*80)
-    output_lines.append("")
-
-    # Add credentials for each instance
-    for idx, item in enumerate(all_credentials, 1):
-        instance = item['instance']
-        creds = item['credentials']
+    # Stream the document straight to the output file
+    with open(output_file, 'w', encoding='utf-8', newline='\n', buffering=64 * 1024) as f:
+        f.write(HEADER_TEMPLATE.format(generated=now.strftime('%Y-%m-%d %H:%M:%S'),
+                                       total=len(all_credentials)))
+
+        # Add credentials for each instance
+        for idx, item in enumerate(all_credentials, 1):
+            instance = item['instance']
+            creds = item['credentials']
+
+            f.write(f"{idx}. {instance.upper()}\n{'-' * 80}\n")
+
+            # Display credentials in a table format
+            for user in ['pentester', 'kali', 'cyberrange', 'root']:
+                if user in creds:
+                    f.write(f"  {user:15s} : {creds[user]}\n")
+
+            f.write("\n")
 
-        output_lines.append(f"{idx}. {instance.upper()}")
-        output_lines.append("-" * 80)
-
-        # Display credentials in a table format
-        for user in ['pentester', 'kali', 'cyberrange', 'root']:
-            if user in creds:
-                output_lines.append(f"  {user:15s} : {creds[user]}")
-
-        output_lines.append("")
-
-    output_lines.append("="*80)
-    output_lines.append("USAGE NOTES")
-    output_lines.append("="*80)
-    output_lines.append("")
-    output_lines.append("RDP Access:")
-    output_lines.append("  Use any RDP client (Windows Remote Desktop, Remmina, etc.)")
-    output_lines.append("  Connect to the Kali box floating IP address")
-    output_lines.append("  Use 'pentester' user for best experience")
-    output_lines.append("")
-    output_lines.append("SSH Access:")
-    output_lines.append("  ssh pentester@<floating-ip>")
-    output_lines.append("  ssh -J sshjump@ssh.cyberrange.rit.edu pentester@<floating-ip>")
-    output_lines.append("")
-    output_lines.append("Security Notes:")
-    output_lines.append("  - These are randomly generated passwords unique to each instance")
-    output_lines.append("  - Keep this document secure")
-    output_lines.append("  - Passwords are also stored on each Kali box at /home/pentester/password.txt")
-    output_lines.append("")
-    output_lines.append("="*80)
-
-    # Write to output file
-    output_content = "\n".join(output_lines)
-
-    with open(output_file, 'w') as f:
-        f.write(output_content)
+        f.write(FOOTER)
 
     print(f"\n✓ Credentials consolidated to: {output_file}")
     print(f"  Total instances: {len(all_credentials)}")
     print(f"\nYou can print this file or share it with your team.")
 
     # Also print preview
-    print("\n" + "="*80)
+    print("\n" + SEPARATOR)
     print("PREVIEW (first 3 instances):")
-    print("="*80)
+    print(SEPARATOR)
     preview_lines = []
     for item in all_credentials[:3]:
         instance = item['instance']
@@ -142,7 +152,7 @@ def consolidate_credentials(creds_dir: str, output_file: str = None):
         if 'pentester' in creds:
             preview_lines.append(f"  pentester : {creds['pentester']}")
     print("\n".join(preview_lines))
-    print("\n" + "="*80)
+    print("\n" + SEPARATOR)
 
     return output_file
 
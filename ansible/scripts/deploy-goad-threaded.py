@@ -1,61 +1,128 @@
 #!/usr/bin/env python3
 """
 Threaded GOAD Deployment Script
-Deploys GOAD across all networks simultaneously using threading
+Deploys GOAD across all networks simultaneously using asyncio
 
 This script:
 1. Reads the Ansible inventory to get all deployment boxes
 2. Runs Ansible playbook to prepare all deployment boxes with GOAD prerequisites
 3. For each deployment box, initiates GOAD provisioning via SSH
-4. Uses threading to run all deployments in parallel
+4. Uses asyncio subprocesses to run all deployments in parallel from a single thread
 5. Monitors progress and reports status with comprehensive logging
 """
 
-import subprocess
-import threading
+import asyncio
 import sys
-import time
 import re
 import os
+import mmap
+import json
+import random
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional
 from datetime import datetime
+from dataclasses import dataclass
 import argparse
+import atexit
 import logging
+import logging.handlers
+import queue
+from collections import Counter
 
+try:
+    import uvloop  # Optional: faster event loop
+except ImportError:
+    uvloop = None
 
+# uvloop.run only exists in uvloop 0.18+; treat older versions as not installed
+if not hasattr(uvloop, 'run'):
+    uvloop = None
+
+# Deployment box line: name ansible_host=IP ansible_user=ubuntu network_id=N
+# (lines commented out with '#' are skipped)
+DEPLOYMENT_BOX_RE = re.compile(rb'^[ \t]*([^\s#]\S*)[ \t]+ansible_host=(\S+)[^\n]*network_id=(\d+)', re.MULTILINE)
+
+
+def read_log_tail(log_file: Path, max_bytes: int = 8192, start: int = 0) -> str:
+    """Return the last max_bytes of a log file (never before offset start), read with a single seek"""
+    with open(log_file, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(start, f.tell() - max_bytes))
+        return f.read().decode(errors='replace')
+
+
+def read_log_lines(log_file: Path, count: int) -> List[str]:
+    """Return the last count lines of a log file, reading backwards in blocks"""
+    with open(log_file, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        data = b''
+        # One extra newline guarantees the first returned line is complete
+        while pos > 0 and data.count(b'\n') <= count:
+            step = min(8192, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    return data.decode(errors='replace').splitlines(keepends=True)[-count:]
+
+
+def install_child_watcher():
+    """Reap subprocesses via pidfds on the event loop instead of one waitpid thread per child"""
+    # Python 3.12+ already does this by default, and uvloop has its own child handling
+    if uvloop is not None or sys.version_info >= (3, 12) or not hasattr(os, 'pidfd_open'):
+        return
+
+    try:
+        os.close(os.pidfd_open(os.getpid()))
+    except OSError:
+        return  # Kernel without pidfd support (Linux < 5.3)
+
+    asyncio.set_child_watcher(asyncio.PidfdChildWatcher())
+
+
+@dataclass(slots=True)
 class DeploymentBox:
     """Represents a single GOAD deployment box"""
 
-    def __init__(self, name: str, host: str, network_id: int):
-        self.name = name
-        self.host = host
-        self.network_id = network_id
-        self.status = "pending"
-        self.start_time = None
-        self.end_time = None
-        self.output = []
-        self.error_output = []
-        self.attempts = 0
-        self.log_file = None
+    name: str
+    host: str
+    network_id: int
+    status: str = "pending"
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+    error_preview: str = ""
+    attempts: int = 0
+    log_file: Optional[Path] = None
+    key_auth: bool = True  # Cleared if the SSH key is rejected; the box then uses the password
 
     def __repr__(self):
         return f"DeploymentBox({self.name}, {self.host}, network_{self.network_id})"
 
 
 class GOADDeployer:
-    """Manages threaded GOAD deployment across multiple networks"""
+    """Manages concurrent GOAD deployment across multiple networks"""
 
     def __init__(self, inventory_file: str, max_threads: int = 10, goad_provider: str = "proxmox",
-                 max_retries: int = 3, log_dir: str = "./logs"):
+                 max_retries: int = 3, log_dir: str = "./logs", max_jump_connections: int = 10,
+                 ssh_key: Optional[str] = None):
         self.inventory_file = inventory_file
         self.max_threads = max_threads
         self.goad_provider = goad_provider
         self.max_retries = max_retries
         self.log_dir = Path(log_dir)
+        # One timestamp for every log file of this run, so they sort and glob together
+        self.run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
         self.deployment_boxes: List[DeploymentBox] = []
-        self.lock = threading.Lock()
-        self.semaphore = threading.Semaphore(max_threads)
+        # No status lock: every box is only touched by its own task, and all tasks
+        # share one event loop thread, so box updates never interleave
+        self.semaphore = asyncio.Semaphore(max_threads)
+        # Limits simultaneous SSH handshakes through the jump host
+        self.jump_semaphore = asyncio.Semaphore(max_jump_connections)
+
+        # Ansible settings for the preparation playbooks: the free strategy lets each
+        # host run ahead instead of waiting for the slowest host on every task.
+        # Pipelining and SSH ControlPersist are already enabled via ansible.cfg.
+        self.ansible_forks = max(max_threads * 4, 50)  # Never below the ansible.cfg forks
+        self.ansible_env = {**os.environ, 'ANSIBLE_STRATEGY': 'free'}
 
         # Create log directory
         self.log_dir.mkdir(parents=True, exist_ok=True)
@@ -63,20 +130,37 @@ class GOADDeployer:
         # Set up main logger
         self.setup_logging()
 
+        # Optional key authentication (--ssh-key); the public key is installed on the
+        # deployment boxes by the preparation playbook. Otherwise use the shared password.
+        self.ssh_key = Path(ssh_key).expanduser() if ssh_key else None
+        if self.ssh_key and not (self.ssh_key.exists() and self.ssh_key.with_name(self.ssh_key.name + '.pub').exists()):
+            self.logger.warning(f"SSH key {self.ssh_key} (or its .pub) not found, using password authentication")
+            self.ssh_key = None
+
     def setup_logging(self):
         """Set up logging configuration"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        log_file = self.log_dir / f"goad_deployment_{timestamp}.log"
+        log_file = self.log_dir / f"goad_deployment_{self.run_id}.log"
+
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        file_handler = logging.FileHandler(log_file)
+        file_handler.setFormatter(formatter)
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(formatter)
+
+        # Log file writes happen on a single listener thread; the event loop only
+        # puts records on the queue. Console output stays on the calling thread so
+        # it can't interleave with the print() calls mid-line.
+        log_queue = queue.SimpleQueue()
+        self.log_listener = logging.handlers.QueueListener(log_queue, file_handler)
+        self.log_listener.start()
+        atexit.register(self.log_listener.stop)  # Flush queued records on exit
+
+        # Formatting is left to the listener's handler
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))
 
         # Configure root logger
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler(sys.stdout)
-            ]
-        )
+        logging.basicConfig(level=logging.INFO, handlers=[queue_handler, console_handler])
 
         self.logger = logging.getLogger(__name__)
         self.logger.info(f"Logging to {log_file}")
@@ -86,29 +170,19 @@ class GOADDeployer:
         boxes = []
 
         try:
-            with open(self.inventory_file, 'r') as f:
-                lines = f.readlines()
-
-            in_deployment_boxes = False
-            for line in lines:
-                line = line.strip()
-
-                if line.startswith('[deployment_boxes]'):
-                    in_deployment_boxes = True
-                    continue
-
-                if in_deployment_boxes:
-                    # Stop if we hit another section or vars
-                    if line.startswith('[') or not line or line.startswith('#'):
-                        if line.startswith('[deployment_boxes:vars]'):
-                            break
-                        continue
-
-                    # Parse line: name ansible_host=IP ansible_user=ubuntu network_id=N
-                    match = re.match(r'(\S+)\s+ansible_host=(\S+).*network_id=(\d+)', line)
-                    if match:
-                        name, host, network_id = match.groups()
-                        boxes.append(DeploymentBox(name, host, int(network_id)))
+            with open(self.inventory_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as inventory:
+                        # Scan only the [deployment_boxes] section, up to the next section header
+                        start = inventory.find(b'[deployment_boxes]')
+                        if start != -1:
+                            end = inventory.find(b'\n[', start)
+                            if end == -1:
+                                end = len(inventory)
+                            boxes = [
+                                DeploymentBox(match[1].decode(), match[2].decode(), int(match[3]))
+                                for match in DEPLOYMENT_BOX_RE.finditer(inventory, start, end)
+                            ]
 
             print(f"Found {len(boxes)} deployment boxes in inventory")
             return boxes
@@ -120,275 +194,153 @@ class GOADDeployer:
             print(f"Error parsing inventory: {e}", file=sys.stderr)
             sys.exit(1)
 
-    def activate_windows_hosts(self):
-        """Run Ansible playbook to activate Windows hosts before GOAD deployment"""
-        print(f"\n{'='*80}")
-        print("Activating Windows hosts...")
-        print(f"{'='*80}\n")
-
-        self.logger.info("Starting Ansible playbook to activate Windows hosts")
-
-        # Determine the ansible directory (parent of scripts directory)
-        script_dir = Path(__file__).parent
-        ansible_dir = script_dir.parent
-        playbook_path = "playbooks/activate-windows-hosts.yml"  # Relative to ansible dir
-
-        # Build ansible-playbook command
-        ansible_cmd = [
-            'ansible-playbook',
-            '-i', 'inventory/hosts',
-            playbook_path
-        ]
-
-        # Create log file for Windows activation
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        activation_log_file = self.log_dir.absolute() / f"windows_activation_{timestamp}.log"
-
-        try:
-            print(f"Running from: {ansible_dir}")
-            print(f"Command: {' '.join(ansible_cmd)}")
-            print(f"Logs: {activation_log_file}\n")
-
-            # Run ansible-playbook from the ansible directory
-            with open(activation_log_file, 'w') as log_f:
-                result = subprocess.run(
-                    ansible_cmd,
-                    stdout=log_f,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    cwd=str(ansible_dir),
-                    timeout=3600  # 60 minute timeout (40 instances * 5 VMs = 200 VMs might take a while)
-                )
-
-            if result.returncode == 0:
-                msg = "✓ Windows activation completed successfully"
-                print(msg)
-                self.logger.info(msg)
-                print(f"\n{'='*80}\n")
-                return True
-            else:
-                msg = f"⚠ Windows activation had issues (return code {result.returncode}), but continuing..."
-                print(msg)
-                self.logger.warning(msg)
-                print(f"Check log file for details: {activation_log_file}")
-
-                # Print last 20 lines of log for immediate feedback
-                try:
-                    with open(activation_log_file, 'r') as f:
-                        lines = f.readlines()
-                        if lines:
-                            print("\nLast 20 lines of activation output:")
-                            print("".join(lines[-20:]))
-                except Exception:
-                    pass
-
-                print(f"\n{'='*80}\n")
-                return True  # Continue anyway - activation issues shouldn't block GOAD deployment
-
-        except subprocess.TimeoutExpired:
-            msg = "⏱ Windows activation timed out after 60 minutes, but continuing..."
-            print(msg)
-            self.logger.warning(msg)
-            print(f"\n{'='*80}\n")
-            return True  # Continue anyway
-
-        except FileNotFoundError:
-            msg = f"⚠ Windows activation playbook not found: {playbook_path}, skipping activation..."
-            print(msg)
-            self.logger.warning(msg)
-            print(f"\n{'='*80}\n")
-            return True  # Continue anyway
-
-        except Exception as e:
-            msg = f"⚠ Error running Windows activation: {e}, but continuing..."
-            print(msg)
-            self.logger.warning(msg)
-            print(f"\n{'='*80}\n")
-            return True  # Continue anyway
-
-    def prepare_kali_boxes(self):
-        """Run Ansible playbook to prepare Kali boxes"""
-        print(f"\n{'='*80}")
-        print("Preparing Kali pentesting boxes...")
-        print(f"{'='*80}\n")
-
-        self.logger.info("Starting Ansible playbook to prepare Kali boxes")
+    async def run_playbook(self, description: str, playbook_path: str, log_name: str,
+                           timeout: int, fatal: bool, extra_vars: Optional[Dict[str, str]] = None) -> bool:
+        """Run an Ansible playbook from the ansible directory, returning True on success"""
+        self.logger.info(f"Starting Ansible playbook for {description}")
 
         # Determine the ansible directory (parent of scripts directory)
         script_dir = Path(__file__).parent
         ansible_dir = script_dir.parent
-        playbook_path = "playbooks/prepare-kali-boxes.yml"  # Relative to ansible dir
 
-        # Build ansible-playbook command
+        # Build ansible-playbook command - use relative paths since we'll cd to ansible dir
         ansible_cmd = [
             'ansible-playbook',
             '-i', 'inventory/hosts',
+            '-f', str(self.ansible_forks),
             playbook_path
         ]
+        if extra_vars:
+            ansible_cmd += ['-e', json.dumps(extra_vars)]
 
-        # Create log file for Kali preparation
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        kali_log_file = self.log_dir.absolute() / f"kali_preparation_{timestamp}.log"
-
-        try:
-            print(f"Running from: {ansible_dir}")
-            print(f"Command: {' '.join(ansible_cmd)}")
-            print(f"Logs: {kali_log_file}\n")
-
-            # Run ansible-playbook from the ansible directory
-            with open(kali_log_file, 'w') as log_f:
-                result = subprocess.run(
-                    ansible_cmd,
-                    stdout=log_f,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    cwd=str(ansible_dir),
-                    timeout=1800  # 30 minute timeout
-                )
-
-            if result.returncode == 0:
-                msg = "✓ Kali preparation completed successfully"
-                print(msg)
-                self.logger.info(msg)
-
-                # Display credentials location
-                creds_dir = ansible_dir / "credentials" / "kali"
-                if creds_dir.exists():
-                    print(f"\nKali credentials saved to: {creds_dir}")
-                    print("Use these for RDP access to Kali boxes")
-
-                print(f"\n{'='*80}\n")
-                return True
-            else:
-                msg = f"⚠ Kali preparation had issues (return code {result.returncode}), but continuing..."
-                print(msg)
-                self.logger.warning(msg)
-                print(f"Check log file for details: {kali_log_file}")
-
-                # Print last 20 lines of log for immediate feedback
-                try:
-                    with open(kali_log_file, 'r') as f:
-                        lines = f.readlines()
-                        if lines:
-                            print("\nLast 20 lines of Kali preparation output:")
-                            print("".join(lines[-20:]))
-                except Exception:
-                    pass
-
-                print(f"\n{'='*80}\n")
-                return True  # Continue anyway
-
-        except subprocess.TimeoutExpired:
-            msg = "⏱ Kali preparation timed out after 30 minutes, but continuing..."
-            print(msg)
-            self.logger.warning(msg)
-            print(f"\n{'='*80}\n")
-            return True  # Continue anyway
-
-        except FileNotFoundError:
-            msg = f"⚠ Kali preparation playbook not found: {playbook_path}, skipping..."
-            print(msg)
-            self.logger.warning(msg)
-            print(f"\n{'='*80}\n")
-            return True  # Continue anyway
-
-        except Exception as e:
-            msg = f"⚠ Error running Kali preparation: {e}, but continuing..."
-            print(msg)
-            self.logger.warning(msg)
-            print(f"\n{'='*80}\n")
-            return True  # Continue anyway
-
-    def prepare_deployment_boxes(self):
-        """Run Ansible playbook to prepare all deployment boxes"""
-        print(f"\n{'='*80}")
-        print("Preparing deployment boxes with Ansible...")
-        print(f"{'='*80}\n")
-
-        self.logger.info("Starting Ansible playbook to prepare deployment boxes")
+        # Create log file for this playbook run (use absolute path)
+        log_file = self.log_dir.absolute() / f"{log_name}_{self.run_id}.log"
 
-        # Determine the ansible directory (parent of scripts directory)
-        script_dir = Path(__file__).parent
-        ansible_dir = script_dir.parent
-        playbook_path = "playbooks/prepare-deployment-boxes.yml"  # Relative to ansible dir
-
-        # Build ansible-playbook command - use relative paths since we'll cd to ansible dir
-        ansible_cmd = [
-            'ansible-playbook',
-            '-i', 'inventory/hosts',
-            playbook_path
-        ]
+        # Only fatal playbooks stop the deployment; the others are reported and skipped
+        fail_icon = "✗" if fatal else "⚠"
+        suffix = "" if fatal else ", but continuing..."
+        log_failure = self.logger.error if fatal else self.logger.warning
 
-        # Create log file for Ansible preparation (use absolute path)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        prep_log_file = self.log_dir.absolute() / f"ansible_preparation_{timestamp}.log"
+        print(f"{description}: {' '.join(ansible_cmd)}")
+        print(f"  Logs: {log_file}")
 
         try:
-            print(f"Running from: {ansible_dir}")
-            print(f"Command: {' '.join(ansible_cmd)}")
-            print(f"Logs: {prep_log_file}\n")
-
             # Run ansible-playbook from the ansible directory so it picks up ansible.cfg
-            with open(prep_log_file, 'w') as log_f:
-                result = subprocess.run(
-                    ansible_cmd,
+            with open(log_file, 'w') as log_f:
+                proc = await asyncio.create_subprocess_exec(
+                    *ansible_cmd,
                     stdout=log_f,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    cwd=str(ansible_dir),  # Run from ansible directory
-                    timeout=1800  # 30 minute timeout
+                    stderr=asyncio.subprocess.STDOUT,
+                    env=self.ansible_env,
+                    cwd=str(ansible_dir)
                 )
-
-            if result.returncode == 0:
-                msg = "✓ Ansible preparation completed successfully"
-                print(msg)
-                self.logger.info(msg)
-                print(f"\n{'='*80}\n")
-                return True
-            else:
-                msg = f"✗ Ansible preparation failed with return code {result.returncode}"
-                print(msg)
-                self.logger.error(msg)
-                print(f"Check log file for details: {prep_log_file}")
-
-                # Print last 20 lines of log for immediate feedback
                 try:
-                    with open(prep_log_file, 'r') as f:
-                        lines = f.readlines()
-                        if lines:
-                            print("\nLast 20 lines of Ansible output:")
-                            print("".join(lines[-20:]))
-                except Exception:
-                    pass
-
-                sys.exit(1)
-
-        except subprocess.TimeoutExpired:
-            msg = "⏱ Ansible preparation timed out after 30 minutes"
+                    await asyncio.wait_for(proc.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    proc.kill()
+                    await proc.wait()
+                    raise
+
+        except asyncio.TimeoutError:
+            msg = f"⏱ {description} timed out after {timeout // 60} minutes{suffix}"
             print(msg)
-            self.logger.error(msg)
-            sys.exit(1)
+            log_failure(msg)
+            return False
 
-        except FileNotFoundError:
-            msg = f"✗ Ansible playbook not found: {playbook_path}"
+        except Exception as e:
+            msg = f"{fail_icon} Error running {description}: {e}{suffix}"
             print(msg)
-            self.logger.error(msg)
-            sys.exit(1)
+            log_failure(msg)
+            return False
 
-        except Exception as e:
-            msg = f"✗ Error running Ansible preparation: {e}"
+        if proc.returncode == 0:
+            msg = f"✓ {description} completed successfully"
             print(msg)
-            self.logger.error(msg)
-            sys.exit(1)
+            self.logger.info(msg)
+            return True
+
+        msg = f"{fail_icon} {description} failed with return code {proc.returncode}{suffix}"
+        print(msg)
+        log_failure(msg)
+        print(f"Check log file for details: {log_file}")
+
+        # Print last 20 lines of log for immediate feedback
+        lines = read_log_lines(log_file, 20)
+        if lines:
+            print(f"\nLast 20 lines of {description} output:")
+            print("".join(lines))
+
+        return False
+
+    def ssh_key_vars(self) -> Optional[Dict[str, str]]:
+        """Extra vars telling the preparation playbook which public key to authorize"""
+        if not self.ssh_key:
+            return None
+        return {'goad_ssh_pubkey': str(self.ssh_key.with_name(self.ssh_key.name + '.pub'))}
+
+    def build_ssh_command(self, box: DeploymentBox, remote_cmd: str, control_master: str = 'no') -> List[str]:
+        """Build the SSH command to run remote_cmd on a deployment box"""
+        if self.ssh_key and box.key_auth:
+            # Key authentication - no sshpass helper process, and never prompt
+            auth = ['ssh', '-i', str(self.ssh_key), '-o', 'IdentitiesOnly=yes', '-o', 'BatchMode=yes']
+        else:
+            # Use sshpass for password authentication
+            auth = ['sshpass', '-p', 'Cyberrange123!', 'ssh']
+
+        # Use jump host to reach deployment boxes
+        return [
+            *auth,
+            '-o', 'StrictHostKeyChecking=no',
+            '-o', 'UserKnownHostsFile=/dev/null',
+            '-o', 'LogLevel=ERROR',
+            # Multiplex over one authenticated connection per box; with ControlMaster=no
+            # ssh uses the master if it exists and falls back to a direct connection
+            '-o', f'ControlMaster={control_master}',
+            '-o', 'ControlPath=~/.ssh/cm-%r@%h:%p',
+            '-o', 'ControlPersist=600s',
+            # Notice dead sessions instead of waiting out the 2 hour timeout
+            '-o', 'ServerAliveInterval=30',
+            '-o', 'ServerAliveCountMax=3',
+            '-J', 'sshjump@ssh.cyberrange.rit.edu',
+            f'cyberrange@{box.host}',
+            remote_cmd
+        ]
 
-    def deploy_goad_on_box(self, box: DeploymentBox):
+    async def open_ssh_master(self, box: DeploymentBox):
+        """Open the persistent SSH master connection to a box through the jump host"""
+        async with self.jump_semaphore:
+            # stdout/stderr must not be pipes: the backgrounded master keeps them open
+            proc = await asyncio.create_subprocess_exec(
+                *self.build_ssh_command(box, 'true', control_master='auto'),
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            try:
+                await asyncio.wait_for(proc.wait(), timeout=120)
+            except asyncio.TimeoutError:
+                # Not fatal - the deployment command connects on its own and reports errors
+                proc.kill()
+                await proc.wait()
+                return
+
+        # A key that exists but can't be used (passphrase without an agent, rejected by
+        # the host) fails under BatchMode; switch this box to password authentication
+        if proc.returncode != 0 and self.ssh_key and box.key_auth:
+            self.logger.warning(f"[{box.network_id:3d}] SSH key authentication to {box.name} failed "
+                                f"(exit {proc.returncode}), falling back to password authentication")
+            box.key_auth = False
+            await self.open_ssh_master(box)
+
+    async def deploy_goad_on_box(self, box: DeploymentBox):
         """Deploy GOAD on a single deployment box with retry logic"""
-        self.semaphore.acquire()
+        await self.semaphore.acquire()
+        log_f = None
 
         try:
-            # Create log file for this deployment
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            box.log_file = self.log_dir / f"deploy_{box.name}_{timestamp}.log"
+            # Create log file for this deployment, kept open across all attempts.
+            # Line buffered, so our headers land before the command's own output.
+            box.log_file = self.log_dir / f"deploy_{box.name}_{self.run_id}.log"
+            log_f = open(box.log_file, 'a', buffering=1)
 
             success = False
             attempt = 0
@@ -397,159 +349,164 @@ class GOADDeployer:
                 attempt += 1
                 box.attempts = attempt
 
-                with self.lock:
-                    box.status = "running"
-                    if box.start_time is None:
-                        box.start_time = datetime.now()
+                box.status = "running"
+                if box.start_time is None:
+                    box.start_time = datetime.now()
+
+                msg = f"[{box.network_id:3d}] Starting GOAD deployment on {box.name} ({box.host}) - Attempt {attempt}/{self.max_retries}"
+                print(msg)
+                self.logger.info(msg)
 
-                    msg = f"[{box.network_id:3d}] Starting GOAD deployment on {box.name} ({box.host}) - Attempt {attempt}/{self.max_retries}"
-                    print(msg)
-                    self.logger.info(msg)
+                # Make sure the shared SSH connection is up (a no-op if it still is)
+                await self.open_ssh_master(box)
 
                 # SSH command to run GOAD provisioning
-                # Use sshpass for password authentication and jump host to reach deployment boxes
                 # Note: The remote command must be a single string argument to SSH
                 remote_cmd = f'cd /opt/goad && source .venv/bin/activate && python3 goad.py -p {self.goad_provider} -l GOAD -m local'
-
-                ssh_cmd = [
-                    'sshpass', '-p', 'Cyberrange123!',
-                    'ssh',
-                    '-o', 'StrictHostKeyChecking=no',
-                    '-o', 'UserKnownHostsFile=/dev/null',
-                    '-o', 'LogLevel=ERROR',
-                    '-J', 'sshjump@ssh.cyberrange.rit.edu',
-                    f'cyberrange@{box.host}',
-                    remote_cmd
-                ]
+                ssh_cmd = self.build_ssh_command(box, remote_cmd)
 
                 try:
+                    # Stream the output straight into the log file rather than buffering it in memory
+                    log_f.write(f"\n{'='*80}\n")
+                    log_f.write(f"Attempt {attempt}/{self.max_retries} - {datetime.now()}\n")
+                    log_f.write(f"{'='*80}\n")
+                    log_f.write(f"Command: {' '.join(ssh_cmd)}\n")
+                    log_f.write(f"\n--- OUTPUT (stdout + stderr) ---\n")
+                    # Error previews only look at this attempt's output, not the header above
+                    output_start = log_f.tell()
+
                     # Run the SSH command
-                    result = subprocess.run(
-                        ssh_cmd,
-                        capture_output=True,
-                        text=True,
-                        timeout=7200  # 2 hour timeout
+                    proc = await asyncio.create_subprocess_exec(
+                        *ssh_cmd,
+                        stdout=log_f,
+                        stderr=asyncio.subprocess.STDOUT
                     )
-
-                    # Save output to log file
-                    with open(box.log_file, 'a') as f:
-                        f.write(f"\n{'='*80}\n")
-                        f.write(f"Attempt {attempt}/{self.max_retries} - {datetime.now()}\n")
-                        f.write(f"{'='*80}\n")
-                        f.write(f"Command: {' '.join(ssh_cmd)}\n")
-                        f.write(f"Return code: {result.returncode}\n")
-                        f.write(f"\n--- STDOUT ---\n")
-                        f.write(result.stdout)
-                        f.write(f"\n--- STDERR ---\n")
-                        f.write(result.stderr)
-                        f.write(f"\n{'='*80}\n")
-
-                    with self.lock:
-                        box.end_time = datetime.now()
-                        duration = (box.end_time - box.start_time).total_seconds()
-
-                        if result.returncode == 0:
-                            box.status = "success"
-                            success = True
-                            msg = f"[{box.network_id:3d}] ✓ GOAD deployment completed on {box.name} (duration: {duration:.0f}s, attempts: {attempt})"
-                            print(msg)
-                            self.logger.info(msg)
-                        else:
-                            box.error_output = result.stderr.split('\n')
-
-                            if attempt < self.max_retries:
-                                msg = f"[{box.network_id:3d}] ⚠ GOAD deployment failed on {box.name}, retrying ({attempt}/{self.max_retries})"
-                                print(msg)
-                                self.logger.warning(msg)
-                                self.logger.warning(f"[{box.network_id:3d}] Error preview: {result.stderr[:200]}")
-                                # Wait a bit before retry to let any race conditions settle
-                                time.sleep(10)
-                            else:
-                                box.status = "failed"
-                                msg = f"[{box.network_id:3d}] ✗ GOAD deployment FAILED on {box.name} after {attempt} attempts (duration: {duration:.0f}s)"
-                                print(msg)
-                                self.logger.error(msg)
-                                self.logger.error(f"[{box.network_id:3d}] Error: {result.stderr[:200]}")
-
-                        box.output = result.stdout.split('\n')
-
-                except subprocess.TimeoutExpired as e:
-                    with self.lock:
-                        # Save timeout info to log
-                        with open(box.log_file, 'a') as f:
-                            f.write(f"\n{'='*80}\n")
-                            f.write(f"Attempt {attempt}/{self.max_retries} - TIMEOUT - {datetime.now()}\n")
-                            f.write(f"{'='*80}\n")
-
+                    try:
+                        await asyncio.wait_for(proc.wait(), timeout=7200)  # 2 hour timeout
+                    except asyncio.TimeoutError:
+                        proc.kill()
+                        await proc.wait()
+                        raise
+
+                    if proc.returncode != 0:
+                        # Keep only the end of the output in memory for error previews
+                        box.error_preview = read_log_tail(box.log_file, 200, start=output_start).strip()
+
+                    log_f.write(f"\nReturn code: {proc.returncode}\n")
+                    log_f.write(f"{'='*80}\n")
+
+                    box.end_time = datetime.now()
+                    duration = (box.end_time - box.start_time).total_seconds()
+
+                    if proc.returncode == 0:
+                        box.status = "success"
+                        success = True
+                        msg = f"[{box.network_id:3d}] ✓ GOAD deployment completed on {box.name} (duration: {duration:.0f}s, attempts: {attempt})"
+                        print(msg)
+                        self.logger.info(msg)
+                    else:
                         if attempt < self.max_retries:
-                            msg = f"[{box.network_id:3d}] ⏱ GOAD deployment TIMEOUT on {box.name}, retrying ({attempt}/{self.max_retries})"
+                            msg = f"[{box.network_id:3d}] ⚠ GOAD deployment failed on {box.name}, retrying ({attempt}/{self.max_retries})"
                             print(msg)
                             self.logger.warning(msg)
-                            time.sleep(10)
+                            self.logger.warning(f"[{box.network_id:3d}] Error preview: {box.error_preview}")
                         else:
-                            box.status = "timeout"
-                            box.end_time = datetime.now()
-                            msg = f"[{box.network_id:3d}] ⏱ GOAD deployment TIMEOUT on {box.name} after {attempt} attempts"
+                            box.status = "failed"
+                            msg = f"[{box.network_id:3d}] ✗ GOAD deployment FAILED on {box.name} after {attempt} attempts (duration: {duration:.0f}s)"
                             print(msg)
                             self.logger.error(msg)
+                            self.logger.error(f"[{box.network_id:3d}] Error: {box.error_preview}")
+
+                except asyncio.TimeoutError:
+                    # Save timeout info to log
+                    log_f.write(f"\n{'='*80}\n")
+                    log_f.write(f"Attempt {attempt}/{self.max_retries} - TIMEOUT - {datetime.now()}\n")
+                    log_f.write(f"{'='*80}\n")
+
+                    if attempt < self.max_retries:
+                        msg = f"[{box.network_id:3d}] ⏱ GOAD deployment TIMEOUT on {box.name}, retrying ({attempt}/{self.max_retries})"
+                        print(msg)
+                        self.logger.warning(msg)
+                    else:
+                        box.status = "timeout"
+                        box.end_time = datetime.now()
+                        msg = f"[{box.network_id:3d}] ⏱ GOAD deployment TIMEOUT on {box.name} after {attempt} attempts"
+                        print(msg)
+                        self.logger.error(msg)
+
+                if not success and attempt < self.max_retries:
+                    # Back off exponentially before retrying, with jitter so boxes that
+                    # failed together (e.g. a jump host outage) don't all retry at once
+                    backoff = min(300, 5 * 2 ** (attempt - 1)) + random.uniform(0, 5)
+                    await asyncio.sleep(backoff)
 
         except Exception as e:
-            with self.lock:
-                box.status = "error"
-                box.end_time = datetime.now()
-                msg = f"[{box.network_id:3d}] ✗ Error deploying GOAD on {box.name}: {e}"
-                print(msg)
-                self.logger.error(msg)
+            box.status = "error"
+            box.end_time = datetime.now()
+            msg = f"[{box.network_id:3d}] ✗ Error deploying GOAD on {box.name}: {e}"
+            print(msg)
+            self.logger.error(msg)
 
-                # Save error to log file
-                if box.log_file:
-                    with open(box.log_file, 'a') as f:
-                        f.write(f"\n{'='*80}\n")
-                        f.write(f"EXCEPTION - {datetime.now()}\n")
-                        f.write(f"{'='*80}\n")
-                        f.write(str(e))
-                        f.write(f"\n{'='*80}\n")
+            # Save error to log file
+            if log_f:
+                log_f.write(f"\n{'='*80}\n")
+                log_f.write(f"EXCEPTION - {datetime.now()}\n")
+                log_f.write(f"{'='*80}\n")
+                log_f.write(str(e))
+                log_f.write(f"\n{'='*80}\n")
 
         finally:
+            if log_f:
+                log_f.close()
             self.semaphore.release()
 
-    def deploy_all(self):
-        """Deploy GOAD on all boxes using threading"""
+    async def deploy_all(self):
+        """Deploy GOAD on all boxes concurrently on a single event loop"""
         self.deployment_boxes = self.parse_inventory()
 
         if not self.deployment_boxes:
             print("No deployment boxes found in inventory!")
             return
 
-        # Activate Windows hosts before GOAD deployment
-        self.activate_windows_hosts()
+        print(f"\n{'='*80}")
+        print("Running Ansible preparation playbooks...")
+        print(f"{'='*80}\n")
+
+        # The playbooks target disjoint host groups, so run them concurrently
+        _, kali_ready, boxes_ready = await asyncio.gather(
+            # Activate Windows hosts before GOAD deployment (200 VMs might take a while)
+            self.run_playbook("Windows activation", "playbooks/activate-windows-hosts.yml",
+                              "windows_activation", timeout=3600, fatal=False),
+            # Prepare Kali boxes with pentester user and RDP access
+            self.run_playbook("Kali preparation", "playbooks/prepare-kali-boxes.yml",
+                              "kali_preparation", timeout=1800, fatal=False),
+            # Prepare all deployment boxes with Ansible before starting GOAD deployment
+            self.run_playbook("Ansible preparation", "playbooks/prepare-deployment-boxes.yml",
+                              "ansible_preparation", timeout=1800, fatal=True,
+                              extra_vars=self.ssh_key_vars())
+        )
 
-        # Prepare Kali boxes with pentester user and RDP access
-        self.prepare_kali_boxes()
+        if kali_ready:
+            # Display credentials location
+            creds_dir = Path(__file__).parent.parent / "credentials" / "kali"
+            if creds_dir.exists():
+                print(f"\nKali credentials saved to: {creds_dir}")
+                print("Use these for RDP access to Kali boxes")
 
-        # Prepare all deployment boxes with Ansible before starting GOAD deployment
-        self.prepare_deployment_boxes()
+        if not boxes_ready:
+            sys.exit(1)
 
         print(f"\n{'='*80}")
-        print(f"Starting threaded GOAD deployment")
+        print(f"Starting parallel GOAD deployment")
         print(f"Total instances: {len(self.deployment_boxes)}")
-        print(f"Max parallel threads: {self.max_threads}")
+        print(f"Max parallel deployments: {self.max_threads}")
         print(f"GOAD provider: {self.goad_provider}")
         print(f"{'='*80}\n")
 
         start_time = datetime.now()
 
-        # Create and start threads
-        threads = []
-        for box in self.deployment_boxes:
-            thread = threading.Thread(target=self.deploy_goad_on_box, args=(box,))
-            thread.start()
-            threads.append(thread)
-            time.sleep(0.1)  # Small delay to stagger starts
-
-        # Wait for all threads to complete
-        for thread in threads:
-            thread.join()
+        # Start one deployment task per box and wait for all of them to complete
+        await asyncio.gather(*(self.deploy_goad_on_box(box) for box in self.deployment_boxes))
 
         end_time = datetime.now()
         total_duration = (end_time - start_time).total_seconds()
@@ -559,10 +516,11 @@ class GOADDeployer:
 
     def print_summary(self, total_duration: float):
         """Print deployment summary"""
-        success_count = sum(1 for box in self.deployment_boxes if box.status == "success")
-        failed_count = sum(1 for box in self.deployment_boxes if box.status == "failed")
-        timeout_count = sum(1 for box in self.deployment_boxes if box.status == "timeout")
-        error_count = sum(1 for box in self.deployment_boxes if box.status == "error")
+        status_counts = Counter(box.status for box in self.deployment_boxes)
+        success_count = status_counts["success"]
+        failed_count = status_counts["failed"]
+        timeout_count = status_counts["timeout"]
+        error_count = status_counts["error"]
 
         # Count retries
         total_attempts = sum(box.attempts for box in self.deployment_boxes)
@@ -588,8 +546,9 @@ class GOADDeployer:
                 if box.status in ["failed", "timeout", "error"]:
                     duration = (box.end_time - box.start_time).total_seconds() if box.start_time and box.end_time else 0
                     print(f"  [{box.network_id:3d}] {box.name} ({box.host}) - {box.status} - {duration:.0f}s - {box.attempts} attempts")
-                    if box.error_output:
-                        print(f"        Error preview: {box.error_output[0][:100]}")
+                    if box.error_preview:
+                        last_line = box.error_preview.rsplit('\n', 1)[-1]
+                        print(f"        Error preview: {last_line[:100]}")
                     if box.log_file:
                         print(f"        Log file: {box.log_file}")
             print()
@@ -610,7 +569,7 @@ def main():
                     '  1. Activates all Windows hosts using KMS\n'
                     '  2. Prepares all Kali boxes (pentester user, RDP access, credentials)\n'
                     '  3. Prepares all deployment boxes using Ansible\n'
-                    '  4. Deploys GOAD on all boxes simultaneously using threading\n'
+                    '  4. Deploys GOAD on all boxes simultaneously using asyncio\n'
                     '  5. Retries failed deployments automatically\n'
                     '  6. Logs all operations for debugging\n'
                     '  7. Saves Kali credentials to ansible/credentials/kali/ for printout',
@@ -672,6 +631,21 @@ logged to the specified log directory.
         help='Directory to store deployment logs (default: ./logs)'
     )
 
+    parser.add_argument(
+        '--ssh-key',
+        default=None,
+        help='Opt-in private key for SSH to the deployment boxes; its .pub is installed during preparation. '
+             'Boxes where the key is rejected fall back to password authentication via sshpass '
+             '(default: password authentication only)'
+    )
+
+    parser.add_argument(
+        '--jump-connections',
+        type=int,
+        default=10,
+        help='Maximum number of simultaneous SSH connection setups through the jump host (default: 10)'
+    )
+
     args = parser.parse_args()
 
     # Create deployer and run
@@ -680,10 +654,15 @@ logged to the specified log directory.
         max_threads=args.threads,
         goad_provider=args.provider,
         max_retries=args.retries,
-        log_dir=args.log_dir
+        log_dir=args.log_dir,
+        max_jump_connections=args.jump_connections,
+        ssh_key=args.ssh_key
     )
 
-    deployer.deploy_all()
+    # Use uvloop's faster event loop when it is installed
+    install_child_watcher()
+    run = uvloop.run if uvloop is not None else asyncio.run
+    run(deployer.deploy_all())
 
 
 if __name__ == '__main__':
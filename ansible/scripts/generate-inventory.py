@@ -7,173 +7,292 @@ This creates an inventory file with all deployment boxes organized by network
 import json
 import sys
 import os
+import hashlib
 import subprocess
+import tempfile
+from itertools import zip_longest
+from pathlib import Path
 
-def get_terraform_output():
-    """Get terraform output as JSON"""
+try:
+    from orjson import loads as json_loads  # Optional: faster JSON parser
+except ImportError:
+    from json import loads as json_loads
+
+try:
+    import ijson  # Optional: incremental parser for large terraform outputs
+    JSON_ERRORS = (ValueError, ijson.JSONError)
+except ImportError:
+    ijson = None
+    JSON_ERRORS = (ValueError,)
+
+# Paths are resolved once at import
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent.parent
+OPENTOFU_DIR = PROJECT_ROOT / 'opentofu'
+INVENTORY_FILE = SCRIPT_DIR.parent / 'inventory' / 'hosts'
+
+TOFU_OUTPUT_CMD = ['tofu', 'output', '-json']
+
+# Terraform output is cached here, keyed by the state file's mtime and size
+# and the set of outputs we use
+CACHE_DIR = Path.home() / '.cache' / 'goad-inventory'
+
+def get_cache_file():
+    """Return the cache path for the current terraform state, or None without a local state"""
     try:
-        # Get the script's directory and find opentofu directory
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(os.path.dirname(script_dir))
-        opentofu_dir = os.path.join(project_root, 'opentofu')
-
-        result = subprocess.run(
-            ['tofu', 'output', '-json'],
-            cwd=opentofu_dir,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return json.loads(result.stdout)
-    except Exception as e:
-        print(f"Error getting terraform output: {e}", file=sys.stderr)
-        sys.exit(1)
+        state = (OPENTOFU_DIR / 'terraform.tfstate').stat()
+    except OSError:
+        return None
+    # Prefix with the project path so separate checkouts don't share entries
+    project = hashlib.sha1(os.fsencode(OPENTOFU_DIR)).hexdigest()[:12]
+    # Only NEEDED_KEYS are cached, so a different key set must not reuse an old entry
+    keys = hashlib.sha1(",".join(sorted(NEEDED_KEYS)).encode()).hexdigest()[:8]
+    return CACHE_DIR / f"{project}-{keys}-{state.st_mtime_ns}-{state.st_size}.json"
+
+def load_cached_output(cache_file):
+    """Load cached terraform output, or None if missing or unreadable"""
+    try:
+        return json_loads(cache_file.read_bytes())
+    except (OSError, *JSON_ERRORS):
+        return None
+
+def save_cached_output(cache_file, tf_output):
+    """Atomically write terraform output to the cache and drop this project's stale entries"""
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    try:
+        CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # Outputs can include credentials, so keep the cache private
+        with open(os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as f:
+            json.dump(tf_output, f)
+        os.replace(tmp_file, cache_file)
+
+        project = cache_file.name.split('-', 1)[0]
+        for stale in CACHE_DIR.glob(f"{project}-*.json"):
+            if stale != cache_file:
+                stale.unlink()
+    except OSError as e:
+        print(f"Warning: could not cache terraform output: {e}", file=sys.stderr)
+
+def run_tofu_output():
+    """Run `tofu output -json` and parse its output"""
+    if ijson is None:
+        # communicate() drains stdout and stderr together, so neither pipe can fill and stall tofu
+        with subprocess.Popen(
+            TOFU_OUTPUT_CMD,
+            cwd=OPENTOFU_DIR,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        ) as proc:
+            stdout, stderr = proc.communicate()
+
+        if proc.returncode:
+            raise subprocess.CalledProcessError(proc.returncode, proc.args, stderr=stderr)
+        # Both orjson and json accept bytes directly, no need to decode stdout first
+        parsed = json_loads(stdout)
+        # Keep only the outputs we use
+        return {key: parsed[key] for key in NEEDED_KEYS if key in parsed}
+
+    # stdout is read incrementally here, so stderr goes to a temp file
+    # rather than a pipe tofu could fill while we wait on stdout
+    with tempfile.TemporaryFile() as stderr_file:
+        with subprocess.Popen(
+            TOFU_OUTPUT_CMD,
+            cwd=OPENTOFU_DIR,
+            stdout=subprocess.PIPE,
+            stderr=stderr_file
+        ) as proc:
+            # Parse errors are only reported if tofu itself succeeded
+            parse_error = None
+            try:
+                # Parse outputs as tofu writes them, keeping only the ones we use
+                tf_output = {
+                    key: output
+                    for key, output in ijson.kvitems(proc.stdout, '', use_float=True)
+                    if key in NEEDED_KEYS
+                }
+            except JSON_ERRORS as e:
+                parse_error = e
+                # Drain the rest so tofu exits normally instead of on a broken pipe
+                while proc.stdout.read(64 * 1024):
+                    pass
+
+        if proc.returncode:
+            stderr_file.seek(0)
+            raise subprocess.CalledProcessError(proc.returncode, proc.args, stderr=stderr_file.read())
+    if parse_error:
+        raise parse_error
+    return tf_output
+
+def get_terraform_output():
+    """Get terraform output as JSON, reusing the cached copy while the state is unchanged"""
+    cache_file = get_cache_file()
+    # GOAD_INV_NOCACHE=1 forces a fresh tofu run (the cache is still refreshed)
+    if cache_file and not os.environ.get('GOAD_INV_NOCACHE'):
+        tf_output = load_cached_output(cache_file)
+        if tf_output is not None:
+            return tf_output
+
+    tf_output = run_tofu_output()
+    if cache_file:
+        save_cached_output(cache_file, tf_output)
+    return tf_output
+
+# Host line formats, called with a (name, ip, network_id) tuple. Each line
+# starts with a newline so it can be appended straight after the group header.
+HOST_LINE = "\n%s ansible_host=%s network_id=%d".__mod__
+DEPLOY_LINE = "\n%s ansible_host=%s ansible_user=cyberrange network_id=%d".__mod__
+
+# Host groups filled into TEMPLATE:
+# (group, IPs output, names output, default name suffix, host line format)
+HOST_GROUPS = [
+    ("deployment_boxes", "ubuntu_deploy_floating_ips", "ubuntu_deploy_names", "ubuntu-deploy", DEPLOY_LINE),
+    ("kali_boxes", "kali_floating_ips", "kali_names", "kali", HOST_LINE),
+    ("windows_dc01", "dc01_floating_ips", "dc01_names", "dc01", HOST_LINE),
+    ("windows_dc02", "dc02_floating_ips", "dc02_names", "dc02", HOST_LINE),
+    ("windows_dc03", "dc03_floating_ips", "dc03_names", "dc03", HOST_LINE),
+    ("windows_srv02", "srv02_floating_ips", "srv02_names", "srv02", HOST_LINE),
+    ("windows_srv03", "srv03_floating_ips", "srv03_names", "srv03", HOST_LINE),
+]
+
+# Terraform outputs the inventory is built from
+NEEDED_KEYS = frozenset({key for group in HOST_GROUPS for key in group[1:3]} | {'deployment_summary'})
+
+# Full inventory layout. Each {group} field expands to that group's host
+# lines, so an empty group is just its header.
+TEMPLATE = """[deployment_boxes]{deployment_boxes}
+
+[deployment_boxes:vars]
+ansible_python_interpreter=/usr/bin/python3
+ansible_ssh_common_args='-o StrictHostKeyChecking=no -J sshjump@ssh.cyberrange.rit.edu'
+ansible_password=Cyberrange123!
+
+# Kali Pentesting Boxes
+[kali_boxes]{kali_boxes}
+
+[kali_boxes:vars]
+ansible_python_interpreter=/usr/bin/python3
+ansible_ssh_common_args='-o StrictHostKeyChecking=no -J sshjump@ssh.cyberrange.rit.edu'
+ansible_user=cyberrange
+ansible_password=Cyberrange123!
+
+# Windows Domain Controllers
+[windows_dc01]{windows_dc01}
+
+[windows_dc02]{windows_dc02}
+
+[windows_dc03]{windows_dc03}
+
+# Windows Servers
+[windows_srv02]{windows_srv02}
+
+[windows_srv03]{windows_srv03}
+
+[windows_domain_controllers:children]
+windows_dc01
+windows_dc02
+windows_dc03
+
+[windows_servers:children]
+windows_srv02
+windows_srv03
+
+[windows:children]
+windows_domain_controllers
+windows_servers
+
+[windows:vars]
+ansible_user=cyberrange
+ansible_password=Cyberrange123!
+ansible_connection=winrm
+ansible_winrm_transport=ntlm
+ansible_winrm_server_cert_validation=ignore
+ansible_port=5986
+ansible_winrm_scheme=https
+# WinRM over SOCKS5 proxy
+ansible_winrm_proxy=socks5h://ssh.cyberrange.rit.edu:1080
+# Disable become - WinRM doesn't support privilege escalation via sudo
+become=false
+
+# Network information from Terraform
+# Total GOAD instances: {goad_instances}
+# Total deployment boxes: {deployment_box_count}
+# Total Kali boxes: {kali_box_count}
+# Total Windows VMs: {windows_vm_count}
+"""
+
+def pair_hosts(ips, names, default_prefix):
+    """Return (name, ip, network_id) for every host that has an IP"""
+    # Names fall back to the default if terraform gave fewer (or empty) names than IPs
+    return [
+        (name or f"goad-{network_id}-{default_prefix}", ip, network_id)
+        for network_id, (ip, name) in enumerate(zip_longest(ips, names), 1)
+        if ip
+    ]
 
 def generate_inventory(tf_output):
     """Generate inventory file content"""
-    inventory = ["[deployment_boxes]"]
-
-    # Get all ubuntu deployment box IPs
-    ubuntu_ips = tf_output.get('ubuntu_deploy_floating_ips', {}).get('value', [])
-    ubuntu_names = tf_output.get('ubuntu_deploy_names', {}).get('value', [])
-
-    if ubuntu_ips:
-        for idx, ip in enumerate(ubuntu_ips):
-            if ip:  # Only add if IP exists
-                name = ubuntu_names[idx] if idx < len(ubuntu_names) else f"goad-{idx+1}-ubuntu-deploy"
-                inventory.append(f"{name} ansible_host={ip} ansible_user=cyberrange network_id={idx+1}")
-
-    inventory.append("")
-    inventory.append("[deployment_boxes:vars]")
-    inventory.append("ansible_python_interpreter=/usr/bin/python3")
-    inventory.append("ansible_ssh_common_args='-o StrictHostKeyChecking=no -J sshjump@ssh.cyberrange.rit.edu'")
-    inventory.append("ansible_password=Cyberrange123!")
-
-    # Add Kali boxes
-    inventory.append("")
-    inventory.append("# Kali Pentesting Boxes")
-    inventory.append("[kali_boxes]")
-    kali_ips = tf_output.get('kali_floating_ips', {}).get('value', [])
-    kali_names = tf_output.get('kali_names', {}).get('value', [])
-    for idx, ip in enumerate(kali_ips):
-        if ip:
-            name = kali_names[idx] if idx < len(kali_names) else f"goad-{idx+1}-kali"
-            inventory.append(f"{name} ansible_host={ip} network_id={idx+1}")
-
-    inventory.append("")
-    inventory.append("[kali_boxes:vars]")
-    inventory.append("ansible_python_interpreter=/usr/bin/python3")
-    inventory.append("ansible_ssh_common_args='-o StrictHostKeyChecking=no -J sshjump@ssh.cyberrange.rit.edu'")
-    inventory.append("ansible_user=cyberrange")
-    inventory.append("ansible_password=Cyberrange123!")
-
-    # Add Windows hosts
-    inventory.append("")
-    inventory.append("# Windows Domain Controllers")
-    inventory.append("[windows_dc01]")
-    dc01_ips = tf_output.get('dc01_floating_ips', {}).get('value', [])
-    dc01_names = tf_output.get('dc01_names', {}).get('value', [])
-    for idx, ip in enumerate(dc01_ips):
-        if ip:
-            name = dc01_names[idx] if idx < len(dc01_names) else f"goad-{idx+1}-dc01"
-            inventory.append(f"{name} ansible_host={ip} network_id={idx+1}")
-
-    inventory.append("")
-    inventory.append("[windows_dc02]")
-    dc02_ips = tf_output.get('dc02_floating_ips', {}).get('value', [])
-    dc02_names = tf_output.get('dc02_names', {}).get('value', [])
-    for idx, ip in enumerate(dc02_ips):
-        if ip:
-            name = dc02_names[idx] if idx < len(dc02_names) else f"goad-{idx+1}-dc02"
-            inventory.append(f"{name} ansible_host={ip} network_id={idx+1}")
-
-    inventory.append("")
-    inventory.append("[windows_dc03]")
-    dc03_ips = tf_output.get('dc03_floating_ips', {}).get('value', [])
-    dc03_names = tf_output.get('dc03_names', {}).get('value', [])
-    for idx, ip in enumerate(dc03_ips):
-        if ip:
-            name = dc03_names[idx] if idx < len(dc03_names) else f"goad-{idx+1}-dc03"
-            inventory.append(f"{name} ansible_host={ip} network_id={idx+1}")
-
-    inventory.append("")
-    inventory.append("# Windows Servers")
-    inventory.append("[windows_srv02]")
-    srv02_ips = tf_output.get('srv02_floating_ips', {}).get('value', [])
-    srv02_names = tf_output.get('srv02_names', {}).get('value', [])
-    for idx, ip in enumerate(srv02_ips):
-        if ip:
-            name = srv02_names[idx] if idx < len(srv02_names) else f"goad-{idx+1}-srv02"
-            inventory.append(f"{name} ansible_host={ip} network_id={idx+1}")
-
-    inventory.append("")
-    inventory.append("[windows_srv03]")
-    srv03_ips = tf_output.get('srv03_floating_ips', {}).get('value', [])
-    srv03_names = tf_output.get('srv03_names', {}).get('value', [])
-    for idx, ip in enumerate(srv03_ips):
-        if ip:
-            name = srv03_names[idx] if idx < len(srv03_names) else f"goad-{idx+1}-srv03"
-            inventory.append(f"{name} ansible_host={ip} network_id={idx+1}")
-
-    # Windows group aggregations
-    inventory.append("")
-    inventory.append("[windows_domain_controllers:children]")
-    inventory.append("windows_dc01")
-    inventory.append("windows_dc02")
-    inventory.append("windows_dc03")
-
-    inventory.append("")
-    inventory.append("[windows_servers:children]")
-    inventory.append("windows_srv02")
-    inventory.append("windows_srv03")
-
-    inventory.append("")
-    inventory.append("[windows:children]")
-    inventory.append("windows_domain_controllers")
-    inventory.append("windows_servers")
-
-    # WinRM configuration for Windows hosts
-    inventory.append("")
-    inventory.append("[windows:vars]")
-    inventory.append("ansible_user=cyberrange")
-    inventory.append("ansible_password=Cyberrange123!")
-    inventory.append("ansible_connection=winrm")
-    inventory.append("ansible_winrm_transport=ntlm")
-    inventory.append("ansible_winrm_server_cert_validation=ignore")
-    inventory.append("ansible_port=5986")
-    inventory.append("ansible_winrm_scheme=https")
-    inventory.append("# WinRM over SOCKS5 proxy")
-    inventory.append("ansible_winrm_proxy=socks5h://ssh.cyberrange.rit.edu:1080")
-    inventory.append("# Disable become - WinRM doesn't support privilege escalation via sudo")
-    inventory.append("become=false")
+    sections = {}
+    group_hosts = {}
+    windows_host_lists = []
+
+    # Unwrap every terraform output once instead of chaining .get() per group
+    values = {key: (output.get('value') if isinstance(output, dict) else None)
+              for key, output in tf_output.items()}
+
+    for group, ips_key, names_key, default_prefix, host_line in HOST_GROUPS:
+        hosts = pair_hosts(values.get(ips_key) or [], values.get(names_key) or [], default_prefix)
+        group_hosts[group] = hosts
+        if group.startswith("windows_"):
+            windows_host_lists.append(hosts)
+        sections[group] = "".join(map(host_line, hosts))
 
     # Add network information for orchestration
-    inventory.append("")
-    inventory.append("# Network information from Terraform")
-    goad_instances = tf_output.get('deployment_summary', {}).get('value', {}).get('goad_instances', 0)
-    inventory.append(f"# Total GOAD instances: {goad_instances}")
-    inventory.append(f"# Total deployment boxes: {len(ubuntu_ips)}")
-    inventory.append(f"# Total Kali boxes: {len(kali_ips)}")
-    inventory.append(f"# Total Windows VMs: {len(dc01_ips) + len(dc02_ips) + len(dc03_ips) + len(srv02_ips) + len(srv03_ips)}")
+    sections['goad_instances'] = (values.get('deployment_summary') or {}).get('goad_instances', 0)
+    sections['deployment_box_count'] = len(group_hosts['deployment_boxes'])
+    sections['kali_box_count'] = len(group_hosts['kali_boxes'])
+    sections['windows_vm_count'] = sum(map(len, windows_host_lists))
 
-    return "\n".join(inventory)
+    return TEMPLATE.format_map(sections)
 
 def main():
     """Main function"""
     print("Generating inventory from Terraform output...")
-    tf_output = get_terraform_output()
-    inventory = generate_inventory(tf_output)
+    try:
+        tf_output = get_terraform_output()
+    except FileNotFoundError as e:
+        if e.filename == 'tofu':
+            print("Error: tofu not found in PATH - install OpenTofu first", file=sys.stderr)
+        else:
+            print(f"Error: OpenTofu directory not found: {OPENTOFU_DIR}", file=sys.stderr)
+        sys.exit(1)
+    except subprocess.CalledProcessError as e:
+        # Only decode stderr when something actually went wrong
+        print(f"Error: tofu output failed with exit code {e.returncode}:", file=sys.stderr)
+        print(e.stderr.decode(errors='replace').rstrip(), file=sys.stderr)
+        sys.exit(1)
+    except JSON_ERRORS as e:
+        print(f"Error: could not parse tofu output as JSON: {e}", file=sys.stderr)
+        sys.exit(1)
 
-    # Get the script's directory and find inventory file path
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    inventory_file = os.path.join(os.path.dirname(script_dir), 'inventory', 'hosts')
+    # Missing outputs usually mean the state predates a change to outputs.tf
+    missing = NEEDED_KEYS - tf_output.keys()
+    if missing:
+        print(f"Warning: terraform output is missing {', '.join(sorted(missing))}; "
+              "run 'tofu apply' to refresh it", file=sys.stderr)
 
-    with open(inventory_file, 'w') as f:
+    # The template renders in one pass; reuse that string rather than re-reading the file
+    inventory = generate_inventory(tf_output)
+    with open(INVENTORY_FILE, 'w') as f:
         f.write(inventory)
 
-    print(f"Inventory written to {inventory_file}")
-    print("\nInventory preview:")
-    print(inventory)
+    print(f"Inventory written to {INVENTORY_FILE}")
+    # Only show the full preview when someone is watching a terminal
+    if sys.stdout.isatty() and not os.environ.get('GOAD_QUIET'):
+        print("\nInventory preview:")
+        sys.stdout.write(inventory)
+    else:
+        line_count = inventory.count("\n")
+        print(f"Inventory has {line_count} lines (preview skipped)")
 
 if __name__ == '__main__':
     main()